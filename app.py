@@ -5,33 +5,60 @@ Built by Hassan Ahmed
 """
 
 import os
-import json
+import re
 import uuid
 import logging
+import queue
 import tempfile
 import csv
 import io
 import smtplib
+import threading
+import zlib
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
 from flask import (
     Flask, render_template, request, redirect,
-    url_for, flash, jsonify, send_file, make_response
+    url_for, flash, jsonify, send_file, Response, stream_with_context
 )
+from flask.json.provider import JSONProvider
+from flask_compress import Compress
 from flask_sqlalchemy import SQLAlchemy
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
 
 load_dotenv()
 
-from utils.parser import extract_text_from_file
+from utils.parser import extract_text_from_stream
 from utils.analyzer import analyze_resume
 from utils.report import generate_pdf_report
 
+# ── JSON ──────────────────────────────────────────────────────────────────────
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson (C-accelerated dumps/loads)."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+            mimetype="application/json",
+        )
+
+
 # ── App ───────────────────────────────────────────────────────────────────────
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 app.secret_key = os.environ.get("SECRET_KEY", "dev-secret-key-change-in-production")
 
 # ── Database ──────────────────────────────────────────────────────────────────
@@ -39,9 +66,6 @@ BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 INSTANCE_DIR = os.path.join(BASE_DIR, "instance")
 os.makedirs(INSTANCE_DIR, exist_ok=True)
 
-# Use /tmp for uploads (Vercel compatible)
-UPLOAD_FOLDER = "/tmp" if os.path.exists("/tmp") else tempfile.gettempdir()
-
 _default_db = "sqlite:///" + os.path.join(INSTANCE_DIR, "resume_analyzer.db")
 DATABASE_URL = os.environ.get("DATABASE_URL", _default_db)
 
@@ -69,16 +93,28 @@ app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options
 
 # ── Upload ────────────────────────────────────────────────────────────────────
 ALLOWED_EXTENSIONS = {"pdf", "docx", "doc"}
-app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
 app.config["MAX_CONTENT_LENGTH"] = 10 * 1024 * 1024  # 10 MB
 
+# Slow side jobs (PDF build + SMTP) run here instead of on the request thread
+background = ThreadPoolExecutor(max_workers=int(os.environ.get("BACKGROUND_WORKERS", "4")))
+
+CSV_BATCH_SIZE = 500  # rows fetched and written per CSV chunk
+
+EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# ── Compression ───────────────────────────────────────────────────────────────
+app.config["COMPRESS_MIMETYPES"] = ["application/json", "text/html"]
+app.config["COMPRESS_LEVEL"] = 6
+# Compressing a streamed response means buffering all of it first; leave
+# streams alone (the CSV export gzips itself, see gzip_stream)
+app.config["COMPRESS_STREAMS"] = False
+Compress(app)
+
 db = SQLAlchemy(app)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app.jinja_env.filters["enumerate"] = enumerate
-
 
 # ── Model ─────────────────────────────────────────────────────────────────────
 class ResumeAnalysis(db.Model):
@@ -89,8 +125,9 @@ class ResumeAnalysis(db.Model):
                     default=lambda: str(uuid.uuid4()))
     filename = db.Column(db.String(255), nullable=False)
     job_title = db.Column(db.String(255), nullable=True)
-    job_description = db.Column(db.Text, nullable=False)
-    resume_text = db.Column(db.Text, nullable=True)
+    # Large blobs no read path uses; deferred so default SELECTs skip them
+    job_description = db.deferred(db.Column(db.Text, nullable=False))
+    resume_text = db.deferred(db.Column(db.Text, nullable=True))
     score = db.Column(db.Integer, nullable=False, default=0)
     keyword_score = db.Column(db.Integer, nullable=True)
     skills_score = db.Column(db.Integer, nullable=True)
@@ -103,7 +140,25 @@ class ResumeAnalysis(db.Model):
     ats_issues = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # uid lookups use the index backing its UNIQUE constraint; every list
+    # view orders by created_at DESC, so give that its own index.
+    __table_args__ = (
+        db.Index("ix_resume_created_at_desc", created_at.desc()),
+    )
+
+    JSON_FIELDS = ("matched_keywords", "missing_keywords", "matched_skills",
+                   "missing_skills", "suggestions", "ats_issues")
+
+    def _parsed_lists(self):
+        """Parse the JSON list columns once per instance and memoize them."""
+        parsed = self.__dict__.get("_parsed")
+        if parsed is None:
+            parsed = {f: orjson.loads(getattr(self, f) or "[]") for f in self.JSON_FIELDS}
+            self.__dict__["_parsed"] = parsed
+        return parsed
+
     def to_dict(self):
+        parsed = self._parsed_lists()
         return {
             "id": self.id,
             "uid": self.uid,
@@ -113,21 +168,279 @@ class ResumeAnalysis(db.Model):
             "keyword_score": self.keyword_score,
             "skills_score": self.skills_score,
             "format_score": self.format_score,
-            "matched_keywords": json.loads(self.matched_keywords or "[]"),
-            "missing_keywords": json.loads(self.missing_keywords or "[]"),
-            "matched_skills": json.loads(self.matched_skills or "[]"),
-            "missing_skills": json.loads(self.missing_skills or "[]"),
-            "suggestions": json.loads(self.suggestions or "[]"),
-            "ats_issues": json.loads(self.ats_issues or "[]"),
+            "matched_keywords": parsed["matched_keywords"],
+            "missing_keywords": parsed["missing_keywords"],
+            "matched_skills": parsed["matched_skills"],
+            "missing_skills": parsed["missing_skills"],
+            "suggestions": parsed["suggestions"],
+            "ats_issues": parsed["ats_issues"],
             "created_at": self.created_at.strftime("%Y-%m-%d %H:%M"),
         }
 
 
+class ResumeStats(db.Model):
+    """Single-row running totals behind the dashboard counters.
+
+    Kept in step with resume_analysis by the insert/delete hooks below, so
+    the dashboard reads one row instead of scanning every analysis.
+    """
+    __tablename__ = "resume_stats"
+
+    id = db.Column(db.Integer, primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    score_sum = db.Column(db.BigInteger, nullable=False, default=0)
+    high = db.Column(db.Integer, nullable=False, default=0)
+    mid = db.Column(db.Integer, nullable=False, default=0)
+    low = db.Column(db.Integer, nullable=False, default=0)
+
+
+def update_stats(connection, scores, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) `scores` from the stats row."""
+    if not scores:
+        return
+    connection.execute(
+        db.update(ResumeStats).where(ResumeStats.id == 1).values(
+            total=ResumeStats.total + sign * len(scores),
+            score_sum=ResumeStats.score_sum + sign * sum(scores),
+            high=ResumeStats.high + sign * sum(1 for s in scores if s >= 80),
+            mid=ResumeStats.mid + sign * sum(1 for s in scores if 50 <= s < 80),
+            low=ResumeStats.low + sign * sum(1 for s in scores if s < 50),
+        )
+    )
+
+
+@db.event.listens_for(ResumeAnalysis, "after_insert")
+def _stats_after_insert(mapper, connection, target):
+    update_stats(connection, [target.score], 1)
+
+
+@db.event.listens_for(ResumeAnalysis, "after_delete")
+def _stats_after_delete(mapper, connection, target):
+    update_stats(connection, [target.score], -1)
+
+
+def rebuild_stats() -> ResumeStats:
+    """Recompute the stats row from resume_analysis with one aggregate query."""
+    score = ResumeAnalysis.score
+    total, score_sum, high, mid, low = db.session.query(
+        db.func.count(ResumeAnalysis.id),
+        db.func.sum(score),
+        db.func.sum(db.case((score >= 80, 1), else_=0)),
+        db.func.sum(db.case((score.between(50, 79), 1), else_=0)),
+        db.func.sum(db.case((score < 50, 1), else_=0)),
+    ).one()
+    stats = db.session.merge(ResumeStats(
+        id=1, total=total, score_sum=score_sum or 0,
+        high=high or 0, mid=mid or 0, low=low or 0,
+    ))
+    db.session.commit()
+    return stats
+
+
+# ── Write-behind Queue ────────────────────────────────────────────────────────
+# Uploads hand their row to a single writer thread, which inserts whatever has
+# queued up in one statement and one commit (group commit). With concurrent
+# requests per process (gunicorn --threads, see Procfile) a burst of uploads
+# shares a few commits/fsyncs; an idle server still commits at once.
+WRITE_BATCH_SIZE = 128
+WRITE_TIMEOUT = 30  # seconds an upload waits for the writer to pick its row up
+
+_write_q = queue.Queue()
+_writer_lock = threading.Lock()
+_writer_thread = None
+_claim_lock = threading.Lock()  # guards _PendingWrite.claimed / .abandoned
+
+
+class _PendingWrite:
+    __slots__ = ("row", "done", "error", "saved", "claimed", "abandoned")
+
+    def __init__(self, row: dict):
+        self.row = row
+        self.done = threading.Event()
+        self.error = None
+        self.saved = False
+        self.claimed = False    # writer has started inserting it
+        self.abandoned = False  # upload gave up waiting; must not be inserted
+
+
+def _writer() -> None:
+    """Drain the write queue forever, committing each batch once."""
+    while True:
+        batch = [_write_q.get()]
+        while len(batch) < WRITE_BATCH_SIZE:
+            try:
+                batch.append(_write_q.get_nowait())
+            except queue.Empty:
+                break
+
+        with _claim_lock:
+            batch = [pending for pending in batch if not pending.abandoned]
+            for pending in batch:
+                pending.claimed = True
+        if not batch:
+            continue
+
+        try:
+            with app.app_context():
+                try:
+                    _insert_rows([pending.row for pending in batch])
+                    for pending in batch:
+                        pending.saved = True
+                except Exception as exc:
+                    db.session.rollback()
+                    logger.warning("Batched insert of %d rows failed, retrying one by one: %s",
+                                   len(batch), exc)
+                    # One bad row must not cost the rest of the batch their save
+                    for pending in batch:
+                        try:
+                            _insert_rows([pending.row])
+                            pending.saved = True
+                        except Exception as row_exc:
+                            db.session.rollback()
+                            logger.exception("Insert of analysis %s failed: %s",
+                                             pending.row.get("uid"), row_exc)
+                            pending.error = row_exc
+        except Exception as exc:
+            # Session/app-context failure: fail whatever isn't saved, keep the thread alive
+            logger.exception("Write batch failed: %s", exc)
+            for pending in batch:
+                if not pending.saved and pending.error is None:
+                    pending.error = exc
+        finally:
+            for pending in batch:
+                pending.done.set()
+
+
+def _insert_rows(rows: list) -> None:
+    """Insert `rows` and bump the stats in one transaction."""
+    db.session.execute(db.insert(ResumeAnalysis), rows)
+    # ORM bulk inserts skip the after_insert hook
+    update_stats(db.session.connection(), [r["score"] for r in rows], 1)
+    db.session.commit()
+
+
+def queue_insert(row: dict) -> None:
+    """Queue a ResumeAnalysis row and block until the writer has committed it."""
+    global _writer_thread
+    # Started lazily so each forked gunicorn worker gets its own writer
+    with _writer_lock:
+        if _writer_thread is None or not _writer_thread.is_alive():
+            _writer_thread = threading.Thread(target=_writer, name="db-writer", daemon=True)
+            _writer_thread.start()
+
+    pending = _PendingWrite(row)
+    _write_q.put(pending)
+    if not pending.done.wait(WRITE_TIMEOUT):
+        with _claim_lock:
+            if not pending.claimed:
+                # Still queued: withdraw it so a failed upload never saves later
+                pending.abandoned = True
+                raise RuntimeError("Timed out saving the analysis.")
+        # Already being inserted; its outcome is moments away
+        pending.done.wait()
+    if pending.error is not None:
+        raise pending.error
+
+
+# Everything to_dict() needs — skips the large job_description/resume_text blobs.
+SUMMARY_COLUMNS = tuple(
+    getattr(ResumeAnalysis, name) for name in (
+        "id", "uid", "filename", "job_title", "score", "keyword_score",
+        "skills_score", "format_score", *ResumeAnalysis.JSON_FIELDS, "created_at",
+    )
+)
+
+
+def recent_analyses(*columns):
+    """Newest-first analyses query loading only `columns` (default: SUMMARY_COLUMNS)."""
+    return ResumeAnalysis.query.options(
+        db.load_only(*(columns or SUMMARY_COLUMNS))
+    ).order_by(ResumeAnalysis.created_at.desc())
+
+
+def gzip_stream(chunks):
+    """Gzip an iterable of text chunks, flushing after each so it still streams."""
+    gz = zlib.compressobj(app.config["COMPRESS_LEVEL"], zlib.DEFLATED, 31)
+    for chunk in chunks:
+        yield gz.compress(chunk.encode("utf-8")) + gz.flush(zlib.Z_SYNC_FLUSH)
+    yield gz.flush()
+
+
 def allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+# ── Report Cache ──────────────────────────────────────────────────────────────
+# Reports are deterministic per analysis, so each PDF is built once and kept
+# on disk where every worker process can reuse it.
+REPORT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "resume_reports")
+os.makedirs(REPORT_CACHE_DIR, exist_ok=True)
+
+
+def _report_cache_path(uid: str) -> str:
+    return os.path.join(REPORT_CACHE_DIR, f"{uid}.pdf")
+
+
+def get_report(analysis) -> str:
+    """Return the PDF path for `analysis`, generating and caching it on first use."""
+    path = _report_cache_path(analysis.uid)
+    if os.path.exists(path):
+        return path
+
+    generated = generate_pdf_report(analysis.to_dict())
+    if not generated.endswith(".pdf"):
+        return generated  # text fallback — not cached
+    os.replace(generated, path)
+    return path
+
+
+def evict_reports(*uids: str) -> None:
+    """Drop cached reports for deleted analyses."""
+    for uid in uids:
+        try:
+            os.remove(_report_cache_path(uid))
+        except OSError:
+            pass
+
+
 # ── Email Helper ──────────────────────────────────────────────────────────────
+# One persistent SMTP session per worker, so TLS + login are paid once
+_smtp_lock = threading.Lock()
+_smtp_conn = None
+
+
+def _reset_smtp() -> None:
+    """Drop the cached SMTP connection. Caller must hold _smtp_lock."""
+    global _smtp_conn
+    if _smtp_conn is not None:
+        try:
+            _smtp_conn.close()
+        except Exception:
+            pass
+        _smtp_conn = None
+
+
+def _get_smtp(server: str, port: int, user: str, password: str) -> smtplib.SMTP:
+    """Return a live SMTP connection, reconnecting if the cached one went stale.
+
+    Caller must hold _smtp_lock.
+    """
+    global _smtp_conn
+    if _smtp_conn is not None:
+        try:
+            if _smtp_conn.noop()[0] == 250:
+                return _smtp_conn
+        except (smtplib.SMTPException, OSError):
+            pass
+        _reset_smtp()
+
+    conn = smtplib.SMTP(server, port, timeout=30)
+    conn.starttls()
+    conn.login(user, password)
+    _smtp_conn = conn
+    return conn
+
+
 def send_email_with_pdf(to_email: str, pdf_path: str, analysis_data: dict) -> bool:
     """Send PDF report via email."""
     try:
@@ -175,14 +488,17 @@ Built by Hassan Ahmed
             )
             msg.attach(pdf_attachment)
 
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(sender_email, sender_password)
-            server.send_message(msg)
+        with _smtp_lock:
+            try:
+                server = _get_smtp(smtp_server, smtp_port, sender_email, sender_password)
+                server.send_message(msg)
+            except (smtplib.SMTPException, OSError):
+                _reset_smtp()
+                raise
 
         return True
     except Exception as e:
-        logger.exception(f"Email error: {e}")
+        logger.exception("Email error: %s", e)
         return False
 
 
@@ -214,22 +530,21 @@ def upload():
 
     try:
         filename = secure_filename(file.filename)
-        unique_fn = f"{uuid.uuid4().hex}_{filename}"
-        filepath = os.path.join(app.config["UPLOAD_FOLDER"], unique_fn)
-        file.save(filepath)
+        # Parse straight from memory — no temp file write/read/unlink
+        buf = io.BytesIO()
+        file.save(buf)
+        buf.seek(0)
 
-        resume_text = extract_text_from_file(filepath)
+        resume_text = extract_text_from_stream(buf, file.filename.rsplit(".", 1)[1])
         if not resume_text or len(resume_text.strip()) < 50:
             flash("Could not extract readable text. Please check the file.", "error")
-            try:
-                os.remove(filepath)
-            except:
-                pass
             return redirect(url_for("index"))
 
         result = analyze_resume(resume_text, job_description)
 
-        analysis = ResumeAnalysis(
+        uid = str(uuid.uuid4())
+        queue_insert(dict(
+            uid=uid,
             filename=filename,
             job_title=job_title,
             job_description=job_description,
@@ -238,22 +553,15 @@ def upload():
             keyword_score=result["keyword_score"],
             skills_score=result["skills_score"],
             format_score=result["format_score"],
-            matched_keywords=json.dumps(result["matched_keywords"]),
-            missing_keywords=json.dumps(result["missing_keywords"]),
-            matched_skills=json.dumps(result["matched_skills"]),
-            missing_skills=json.dumps(result["missing_skills"]),
-            suggestions=json.dumps(result["suggestions"]),
-            ats_issues=json.dumps(result["ats_issues"]),
-        )
-        db.session.add(analysis)
-        db.session.commit()
-
-        try:
-            os.remove(filepath)
-        except:
-            pass
+            matched_keywords=app.json.dumps(result["matched_keywords"]),
+            missing_keywords=app.json.dumps(result["missing_keywords"]),
+            matched_skills=app.json.dumps(result["matched_skills"]),
+            missing_skills=app.json.dumps(result["missing_skills"]),
+            suggestions=app.json.dumps(result["suggestions"]),
+            ats_issues=app.json.dumps(result["ats_issues"]),
+        ))
 
-        return redirect(url_for("result", uid=analysis.uid))
+        return redirect(url_for("result", uid=uid))
 
     except Exception as exc:
         logger.exception("Upload/analysis error: %s", exc)
@@ -271,7 +579,7 @@ def result(uid):
 def download_report(uid):
     analysis = ResumeAnalysis.query.filter_by(uid=uid).first_or_404()
     try:
-        pdf_path = generate_pdf_report(analysis.to_dict())
+        pdf_path = get_report(analysis)
         return send_file(pdf_path, as_attachment=True,
                          download_name=f"resume_analysis_{uid[:8]}.pdf",
                          mimetype="application/pdf")
@@ -282,85 +590,125 @@ def download_report(uid):
 
 
 # ── NEW: Email Report ─────────────────────────────────────────────────────────
+def _send_email_task(uid: str, email: str) -> bool:
+    """Build the PDF and email it; True if it was sent. Never raises."""
+    try:
+        with app.app_context():
+            analysis = ResumeAnalysis.query.filter_by(uid=uid).first()
+            if analysis is None:
+                logger.warning("Email task: analysis %s no longer exists", uid)
+                return False
+
+            pdf_path = get_report(analysis)
+            try:
+                sent = send_email_with_pdf(email, pdf_path, analysis.to_dict())
+            finally:
+                if os.path.dirname(pdf_path) != REPORT_CACHE_DIR:
+                    try:
+                        os.remove(pdf_path)
+                    except OSError:
+                        pass
+            if not sent:
+                logger.error("Email task: failed to send report %s to %s", uid, email)
+            return sent
+    except Exception as exc:
+        logger.exception("Email task for %s failed: %s", uid, exc)
+        return False
+
+
 @app.route("/email-report/<uid>", methods=["POST"])
 def email_report(uid):
-    """Send PDF report via email."""
-    analysis = ResumeAnalysis.query.filter_by(uid=uid).first_or_404()
+    """Email the PDF report; queued in the background where the process outlives the request."""
+    ResumeAnalysis.query.filter_by(uid=uid).first_or_404()
     email = request.form.get('email', '').strip()
 
     if not email:
         return jsonify({"error": "Email required"}), 400
 
-    import re
-    if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
+    if not EMAIL_RE.match(email):
         return jsonify({"error": "Invalid email"}), 400
 
-    try:
-        pdf_path = generate_pdf_report(analysis.to_dict())
-        success = send_email_with_pdf(email, pdf_path, analysis.to_dict())
-
-        try:
-            os.remove(pdf_path)
-        except:
-            pass
+    if not (os.environ.get('SENDER_EMAIL') and os.environ.get('SENDER_PASSWORD')):
+        return jsonify({"error": "Failed to send. Check email configuration."}), 500
 
-        if success:
+    # Serverless (Vercel) freezes the function once the response is out, so a
+    # queued send might never run there: send inline and report the outcome
+    if os.environ.get('VERCEL'):
+        if _send_email_task(uid, email):
             return jsonify({"success": True, "message": f"Sent to {email}"})
-        else:
-            return jsonify({"error": "Failed to send. Check email configuration."}), 500
-    except Exception as e:
+        return jsonify({"error": "Failed to send. Check email configuration."}), 500
+
+    try:
+        background.submit(_send_email_task, uid, email)
+    except RuntimeError as e:
         return jsonify({"error": str(e)}), 500
 
+    return jsonify({"queued": True, "message": f"Queued for {email}"}), 202
+
 
 # ── NEW: CSV/JSON Export ──────────────────────────────────────────────────────
 @app.route("/export-csv")
 def export_csv():
-    """Export all analyses to CSV."""
-    analyses = ResumeAnalysis.query.order_by(
-        ResumeAnalysis.created_at.desc()
-    ).all()
-
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    writer.writerow([
-        'ID', 'Filename', 'Job Title', 'Overall Score',
-        'Keyword Score', 'Skills Score', 'Format Score',
-        'Matched Keywords', 'Missing Keywords',
-        'Matched Skills', 'Missing Skills', 'Date'
-    ])
-
-    for analysis in analyses:
-        data = analysis.to_dict()
-        writer.writerow([
+    """Stream all analyses as CSV, fetching and writing rows in batches."""
+    list_columns = ("matched_keywords", "missing_keywords", "matched_skills", "missing_skills")
+    analyses = recent_analyses(
+        ResumeAnalysis.id, ResumeAnalysis.filename, ResumeAnalysis.job_title,
+        ResumeAnalysis.score, ResumeAnalysis.keyword_score, ResumeAnalysis.skills_score,
+        ResumeAnalysis.format_score, ResumeAnalysis.created_at,
+        *(getattr(ResumeAnalysis, name) for name in list_columns),
+    ).yield_per(CSV_BATCH_SIZE)
+
+    def to_row(analysis):
+        return [
             analysis.id,
             analysis.filename,
             analysis.job_title or '',
-            data['score'],
-            data['keyword_score'],
-            data['skills_score'],
-            data['format_score'],
-            ', '.join(data['matched_keywords'][:10]),
-            ', '.join(data['missing_keywords'][:10]),
-            ', '.join(data['matched_skills'][:10]),
-            ', '.join(data['missing_skills'][:10]),
+            analysis.score,
+            analysis.keyword_score,
+            analysis.skills_score,
+            analysis.format_score,
+            *(', '.join(orjson.loads(getattr(analysis, name) or '[]')[:10])
+              for name in list_columns),
             analysis.created_at.strftime('%Y-%m-%d %H:%M')
+        ]
+
+    def generate():
+        output = io.StringIO()
+        writer = csv.writer(output)
+
+        writer.writerow([
+            'ID', 'Filename', 'Job Title', 'Overall Score',
+            'Keyword Score', 'Skills Score', 'Format Score',
+            'Matched Keywords', 'Missing Keywords',
+            'Matched Skills', 'Missing Skills', 'Date'
         ])
 
-    output.seek(0)
-    response = make_response(output.getvalue())
-    response.headers['Content-Type'] = 'text/csv'
-    response.headers['Content-Disposition'] = 'attachment; filename=resume_analyses.csv'
+        rows = iter(analyses)
+        while batch := list(islice(rows, CSV_BATCH_SIZE)):
+            writer.writerows(map(to_row, batch))
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+
+        yield output.getvalue()
+
+    body = stream_with_context(generate())
+    headers = {
+        'Content-Disposition': 'attachment; filename=resume_analyses.csv',
+        'Vary': 'Accept-Encoding',
+    }
+    # Flask-Compress would buffer the whole stream, so gzip it chunk by chunk here
+    if request.accept_encodings['gzip'] > 0:
+        body = gzip_stream(body)
+        headers['Content-Encoding'] = 'gzip'
 
-    return response
+    return Response(body, mimetype='text/csv', headers=headers)
 
 
 @app.route("/export-json")
 def export_json():
     """Export all analyses as JSON."""
-    analyses = ResumeAnalysis.query.order_by(
-        ResumeAnalysis.created_at.desc()
-    ).limit(100).all()
+    analyses = recent_analyses().limit(100).all()
 
     data = [a.to_dict() for a in analyses]
 
@@ -375,8 +723,8 @@ def export_json():
 @app.route("/compare")
 def compare_page():
     """Show comparison interface."""
-    analyses = ResumeAnalysis.query.order_by(
-        ResumeAnalysis.created_at.desc()
+    analyses = recent_analyses(
+        ResumeAnalysis.uid, ResumeAnalysis.filename, ResumeAnalysis.score
     ).limit(50).all()
     return render_template("compare.html", analyses=analyses)
 
@@ -384,38 +732,41 @@ def compare_page():
 @app.route("/api/compare/<uid1>/<uid2>")
 def compare_analyses(uid1, uid2):
     """Compare two analyses."""
-    analysis1 = ResumeAnalysis.query.filter_by(uid=uid1).first_or_404()
-    analysis2 = ResumeAnalysis.query.filter_by(uid=uid2).first_or_404()
+    query = ResumeAnalysis.query.options(db.load_only(
+        ResumeAnalysis.filename, ResumeAnalysis.score, ResumeAnalysis.keyword_score,
+        ResumeAnalysis.skills_score, ResumeAnalysis.matched_keywords,
+        ResumeAnalysis.matched_skills,
+    ))
+    analysis1 = query.filter_by(uid=uid1).first_or_404()
+    analysis2 = query.filter_by(uid=uid2).first_or_404()
+
+    data1, data2 = (
+        {
+            "filename": a.filename,
+            "score": a.score,
+            "keyword_score": a.keyword_score,
+            "skills_score": a.skills_score,
+            "matched_keywords": orjson.loads(a.matched_keywords or "[]"),
+            "matched_skills": orjson.loads(a.matched_skills or "[]"),
+        }
+        for a in (analysis1, analysis2)
+    )
 
-    data1 = analysis1.to_dict()
-    data2 = analysis2.to_dict()
+    kw1, kw2 = set(data1['matched_keywords']), set(data2['matched_keywords'])
+    sk1, sk2 = set(data1['matched_skills']), set(data2['matched_skills'])
 
     comparison = {
-        "resume1": {
-            "filename": data1['filename'],
-            "score": data1['score'],
-            "keyword_score": data1['keyword_score'],
-            "skills_score": data1['skills_score'],
-            "matched_keywords": data1['matched_keywords'],
-            "matched_skills": data1['matched_skills']
-        },
-        "resume2": {
-            "filename": data2['filename'],
-            "score": data2['score'],
-            "keyword_score": data2['keyword_score'],
-            "skills_score": data2['skills_score'],
-            "matched_keywords": data2['matched_keywords'],
-            "matched_skills": data2['matched_skills']
-        },
+        "resume1": data1,
+        "resume2": data2,
         "differences": {
             "score_diff": data1['score'] - data2['score'],
             "better_resume": 1 if data1['score'] > data2['score'] else (2 if data2['score'] > data1['score'] else 0),
-            "unique_keywords_1": list(set(data1['matched_keywords']) - set(data2['matched_keywords'])),
-            "unique_keywords_2": list(set(data2['matched_keywords']) - set(data1['matched_keywords'])),
-            "common_keywords": list(set(data1['matched_keywords']) & set(data2['matched_keywords'])),
-            "unique_skills_1": list(set(data1['matched_skills']) - set(data2['matched_skills'])),
-            "unique_skills_2": list(set(data2['matched_skills']) - set(data1['matched_skills'])),
-            "common_skills": list(set(data1['matched_skills']) & set(data2['matched_skills']))
+            "unique_keywords_1": list(kw1 - kw2),
+            "unique_keywords_2": list(kw2 - kw1),
+            "common_keywords": list(kw1 & kw2),
+            "unique_skills_1": list(sk1 - sk2),
+            "unique_skills_2": list(sk2 - sk1),
+            "common_skills": list(sk1 & sk2)
         }
     }
 
@@ -425,12 +776,16 @@ def compare_analyses(uid1, uid2):
 # ── Dashboard ─────────────────────────────────────────────────────────────────
 @app.route("/dashboard")
 def dashboard():
-    analyses = ResumeAnalysis.query.order_by(ResumeAnalysis.created_at.desc()).all()
-    total = len(analyses)
-    avg_score = int(sum(a.score for a in analyses) / total) if total else 0
-    high_score = len([a for a in analyses if a.score >= 80])
-    mid_score = len([a for a in analyses if 50 <= a.score < 80])
-    low_score = len([a for a in analyses if a.score < 50])
+    stats = db.session.get(ResumeStats, 1) or rebuild_stats()
+    total = stats.total
+    avg_score = stats.score_sum // total if total else 0
+    high_score, mid_score, low_score = stats.high, stats.mid, stats.low
+
+    analyses = recent_analyses(
+        ResumeAnalysis.id, ResumeAnalysis.uid, ResumeAnalysis.filename,
+        ResumeAnalysis.job_title, ResumeAnalysis.score, ResumeAnalysis.keyword_score,
+        ResumeAnalysis.skills_score, ResumeAnalysis.created_at,
+    ).all()
     recent_scores = [
         {"filename": a.filename[:20], "score": a.score,
          "date": a.created_at.strftime("%b %d")}
@@ -439,13 +794,12 @@ def dashboard():
     return render_template("dashboard.html",
                            analyses=analyses, total=total, avg_score=avg_score,
                            high_score=high_score, mid_score=mid_score, low_score=low_score,
-                           recent_scores=json.dumps(recent_scores))
+                           recent_scores=app.json.dumps(recent_scores))
 
 
 @app.route("/api/analyses")
 def api_analyses():
-    analyses = ResumeAnalysis.query.order_by(
-        ResumeAnalysis.created_at.desc()).limit(50).all()
+    analyses = recent_analyses().limit(50).all()
     return jsonify([a.to_dict() for a in analyses])
 
 
@@ -454,11 +808,33 @@ def api_delete(analysis_id):
     analysis = db.session.get(ResumeAnalysis, analysis_id)
     if not analysis:
         return jsonify({"error": "Not found"}), 404
+    uid = analysis.uid
     db.session.delete(analysis)
     db.session.commit()
+    evict_reports(uid)
     return jsonify({"success": True})
 
 
+@app.route("/api/delete-batch", methods=["POST"])
+def api_delete_batch():
+    """Delete many analyses in one statement and one commit."""
+    ids = (request.get_json(silent=True) or {}).get("ids")
+    if not isinstance(ids, list) or not all(type(i) is int for i in ids):
+        return jsonify({"error": "ids must be a list of integers"}), 400
+    # RETURNING reports only the rows this statement removed, so two
+    # overlapping batches can't both subtract the same row from the stats
+    deleted = db.session.execute(
+        db.delete(ResumeAnalysis)
+        .where(ResumeAnalysis.id.in_(ids))
+        .returning(ResumeAnalysis.uid, ResumeAnalysis.score)
+    ).all()
+    # Bulk DELETE skips the ORM after_delete hook, so adjust stats here
+    update_stats(db.session.connection(), [score for _, score in deleted], -1)
+    db.session.commit()
+    evict_reports(*(uid for uid, _ in deleted))
+    return jsonify({"success": True, "deleted": len(deleted)})
+
+
 @app.errorhandler(404)
 def page_not_found(e):
     return render_template("404.html"), 404
@@ -474,6 +850,11 @@ def too_large(e):
 with app.app_context():
     try:
         db.create_all()
+        # create_all() skips tables that already exist; add any missing indexes
+        for index in ResumeAnalysis.__table__.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+        if db.session.get(ResumeStats, 1) is None:
+            rebuild_stats()
         logger.info("Database ready.")
     except Exception as exc:
         logger.error("Database init failed: %s", exc)
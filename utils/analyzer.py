@@ -8,13 +8,32 @@ under the 250 MB serverless limit.
 
 import re
 import math
-import random
 import logging
 from collections import Counter
-from typing import Dict, List, Any
+from functools import lru_cache
+from random import Random
+from typing import Dict, FrozenSet, List, Any, NamedTuple, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Optional: numpy vectorises batch_similarity(); single-pair scoring never needs it
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Optional: google-re2 compiles the skill alternation to a linear-time DFA
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Optional: pyahocorasick finds every skill in one automaton pass (preferred)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 # ── Comprehensive Skill Taxonomy (150+ skills) ─────────────────────────────────
 SKILLS_DB = {
     "programming_languages": [
@@ -63,6 +82,44 @@ SKILLS_DB = {
 
 ALL_SKILLS: List[str] = [s for group in SKILLS_DB.values() for s in group]
 
+# Derived views: O(1) membership, longest-first (for alternation) and
+# de-duplicated taxonomy order (for reporting)
+ALL_SKILLS_SET: FrozenSet[str] = frozenset(ALL_SKILLS)
+_SKILLS_BY_LEN: List[str] = sorted(ALL_SKILLS_SET, key=len, reverse=True)
+_SKILLS_IN_ORDER: Tuple[str, ...] = tuple(dict.fromkeys(ALL_SKILLS))
+
+
+def _skill_pattern(skill: str) -> str:
+    # Word-boundary matching so short skills ("c", "r", "go") don't hit inside words
+    return r"\b" + re.escape(skill) + r"\b"
+
+
+# One alternation over every skill, longest first so "github actions" wins
+# over "github". Plain alternation (no lookaround) so RE2 can compile it.
+_SKILL_PATTERN = r"\b(" + "|".join(re.escape(s) for s in _SKILLS_BY_LEN) + r")\b"
+_SKILL_RE = re.compile(_SKILL_PATTERN)
+# RE2's \b is ASCII-only (stdlib's treats "é" as a word char), so it is
+# only used on ASCII text where the two agree
+_SKILL_RE2 = re2.compile(_SKILL_PATTERN) if re2 is not None else None
+
+# Skills contained in a longer one ("github" in "github actions"): the scan
+# consumes the longer match, so add the shorter ones back from this table.
+_NESTED_SKILLS: Dict[str, List[str]] = {
+    skill: [o for o in ALL_SKILLS_SET if o != skill and re.search(_skill_pattern(o), skill)]
+    for skill in ALL_SKILLS_SET
+}
+
+# Aho-Corasick automaton over the same skills. It reports every occurrence,
+# overlapping ones included, so it needs no nested-skill table — only the
+# \b check at both ends of each hit.
+if ahocorasick is not None:
+    _SKILL_AC = ahocorasick.Automaton()
+    for _skill in ALL_SKILLS_SET:
+        _SKILL_AC.add_word(_skill, _skill)
+    _SKILL_AC.make_automaton()
+else:
+    _SKILL_AC = None
+
 SUGGESTIONS_BANK = [
     "Add quantifiable achievements (e.g., 'Increased sales by 30%').",
     "Use strong action verbs: led, built, designed, optimized, reduced.",
@@ -81,7 +138,7 @@ SUGGESTIONS_BANK = [
 # ── Pure-Python Text Utilities ─────────────────────────────────────────────────
 
 # Common English stop words
-_STOP_WORDS = {
+_STOP_WORDS = frozenset({
     "a","an","the","and","or","but","in","on","at","to","for","of","with",
     "by","from","up","about","into","through","during","is","are","was",
     "were","be","been","being","have","has","had","do","does","did","will",
@@ -93,156 +150,248 @@ _STOP_WORDS = {
     "then","because","while","although","though","unless","until","since",
     "after","before","above","below","between","under","over","again",
     "further","once","here","there","own","s","t","re","ve","ll","d",
-}
+})
+
 
+# Runs of 3+ alphanumerics: the span scan, punctuation split and length
+# filter all happen inside the C regex engine in a single pass
+_TOKEN_RE = re.compile(r"[a-z0-9]{3,}")
 
-def _tokenize(text: str) -> List[str]:
-    """Lowercase, strip punctuation, split, remove stop words & short tokens."""
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9\s]", " ", text)
-    return [t for t in text.split() if len(t) > 2 and t not in _STOP_WORDS]
 
+def _tokenize(lower_text: str) -> Counter:
+    """Count the tokens of lowercased text, skipping stop words & short tokens."""
+    return Counter(t for t in _TOKEN_RE.findall(lower_text) if t not in _STOP_WORDS)
 
-def _term_freq(tokens: List[str]) -> Dict[str, float]:
+
+def _term_freq(counts: Counter) -> Dict[str, float]:
     """Compute term frequency (normalised by document length)."""
-    if not tokens:
+    total = sum(counts.values())
+    if not total:
         return {}
-    counts = Counter(tokens)
-    total = len(tokens)
     return {t: c / total for t, c in counts.items()}
 
 
-def _idf(term: str, docs: List[List[str]]) -> float:
-    """Compute inverse document frequency for a term across a corpus."""
-    df = sum(1 for doc in docs if term in doc)
-    if df == 0:
-        return 0.0
-    return math.log((1 + len(docs)) / (1 + df)) + 1.0
+class _Doc(NamedTuple):
+    """Per-text artifacts shared by every analysis step. Cached — never mutate."""
+    lower: str
+    n_words: int
+    counts: Counter
+    tf: Dict[str, float]
 
 
-def _tfidf_vector(tokens: List[str], vocab: List[str],
-                  idf_map: Dict[str, float]) -> List[float]:
-    """Build a TF-IDF vector for given tokens over the vocab."""
-    tf = _term_freq(tokens)
-    return [tf.get(term, 0.0) * idf_map.get(term, 0.0) for term in vocab]
+@lru_cache(maxsize=32)
+def _prepare(text: str) -> _Doc:
+    """Lowercase and tokenize `text` once.
 
+    Every helper below goes through this, so one analyze_resume() call scans
+    each input a single time, and re-analysing the same resume (or JD)
+    against other texts reuses the work.
+    """
+    lower  = text.lower()
+    counts = _tokenize(lower)
+    return _Doc(lower, len(text.split()), counts, _term_freq(counts))
 
-def _cosine_similarity(vec_a: List[float], vec_b: List[float]) -> float:
-    """Cosine similarity between two equal-length vectors."""
-    dot   = sum(a * b for a, b in zip(vec_a, vec_b))
-    mag_a = math.sqrt(sum(a * a for a in vec_a))
-    mag_b = math.sqrt(sum(b * b for b in vec_b))
-    if mag_a == 0 or mag_b == 0:
+
+def _idf(df: int, n_docs: int) -> float:
+    """Smoothed inverse document frequency for a term found in `df` of `n_docs` docs."""
+    if df == 0:
         return 0.0
-    return dot / (mag_a * mag_b)
+    return math.log((1 + n_docs) / (1 + df)) + 1.0
+
+
+def _tfidf_magnitude(tf: Dict[str, float], shared, idf_shared: float,
+                     idf_own: float) -> float:
+    """Euclidean norm of a sparse TF-IDF vector."""
+    return math.sqrt(sum(
+        (w * (idf_shared if t in shared else idf_own)) ** 2 for t, w in tf.items()
+    ))
 
 
 def _similarity(text_a: str, text_b: str) -> float:
     """
     Compute TF-IDF cosine similarity between two texts.
-    Pure Python — no numpy/sklearn required.
+    Pure Python — no numpy/sklearn required. Works on the sparse TF dicts:
+    only shared terms contribute to the dot product, and with two documents
+    a term's IDF depends only on whether it appears in both.
     """
-    tok_a = _tokenize(text_a)
-    tok_b = _tokenize(text_b)
+    tf_a = _prepare(text_a).tf
+    tf_b = _prepare(text_b).tf
 
-    if not tok_a or not tok_b:
+    if not tf_a or not tf_b:
         return 0.0
 
-    # Build shared vocabulary
-    vocab = list(dict.fromkeys(tok_a + tok_b))  # preserve order, dedup
-    docs  = [tok_a, tok_b]
+    shared = tf_a.keys() & tf_b.keys()
+    if not shared:
+        return 0.0    # no common terms: the dot product, and the cosine, is 0
+
+    idf_shared = _idf(2, 2)
+    idf_own    = _idf(1, 2)
+
+    dot   = sum(tf_a[t] * tf_b[t] for t in shared) * idf_shared * idf_shared
+    mag_a = _tfidf_magnitude(tf_a, shared, idf_shared, idf_own)
+    mag_b = _tfidf_magnitude(tf_b, shared, idf_shared, idf_own)
+    if mag_a == 0 or mag_b == 0:
+        return 0.0
+    return dot / (mag_a * mag_b)
 
-    # Pre-compute IDF for each vocab term
-    idf_map = {term: _idf(term, docs) for term in vocab}
 
-    vec_a = _tfidf_vector(tok_a, vocab, idf_map)
-    vec_b = _tfidf_vector(tok_b, vocab, idf_map)
+def batch_similarity(resume_texts: List[str], job_description: str) -> List[float]:
+    """
+    `_similarity(resume, job_description)` for many resumes at once.
 
-    return _cosine_similarity(vec_a, vec_b)
+    With numpy installed the resumes are stacked into one TF matrix over the
+    JD's vocabulary and scored with a few matrix-vector products; otherwise
+    this falls back to the pure-Python pairwise loop. Results are identical.
+    """
+    if np is None:
+        return [_similarity(text, job_description) for text in resume_texts]
+
+    jd_tf = _prepare(job_description).tf
+    if not jd_tf:
+        return [0.0] * len(resume_texts)
+
+    vocab = {t: i for i, t in enumerate(jd_tf)}
+    jd_vec = np.fromiter(jd_tf.values(), dtype=np.float64, count=len(jd_tf))
+    tf_rows = np.zeros((len(resume_texts), len(vocab)))
+    own_sq = np.zeros(len(resume_texts))    # Σ tf² over each resume's whole vocabulary
+    for i, text in enumerate(resume_texts):
+        tf = _prepare(text).tf
+        own_sq[i] = sum(w * w for w in tf.values())
+        for t in tf.keys() & vocab.keys():
+            tf_rows[i, vocab[t]] = tf[t]
+
+    # Shared terms get idf_shared, all others idf_own (see _similarity)
+    sh2, own2 = _idf(2, 2) ** 2, _idf(1, 2) ** 2
+    dot   = (tf_rows @ jd_vec) * sh2
+    mag_a = own2 * own_sq + (sh2 - own2) * (tf_rows * tf_rows).sum(axis=1)
+    mag_b = own2 * (jd_vec @ jd_vec) + (sh2 - own2) * ((tf_rows > 0) @ (jd_vec * jd_vec))
+    norms = np.sqrt(mag_a * mag_b)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(norms > 0, dot / norms, 0.0)
+    return scores.tolist()
 
 
 def _top_keywords(text: str, n: int = 40) -> List[str]:
-    """Return top-n keywords by TF-IDF score (unigrams)."""
-    tokens = _tokenize(text)
-    if not tokens:
-        return []
-    tf = _term_freq(tokens)
-    # IDF relative to a single document — use log(1/tf) as a proxy
-    scored = {t: score * (1 + math.log(1 / score)) for t, score in tf.items()}
-    return sorted(scored, key=scored.get, reverse=True)[:n]
+    """Return top-n keywords by term frequency (unigrams).
+
+    Within a single document any TF-IDF-style weighting is monotonic in the
+    raw count, so ranking by count gives the same order.
+    """
+    return [t for t, _ in _prepare(text).counts.most_common(n)]
 
 
 # ── Skill & Keyword Matching ───────────────────────────────────────────────────
 
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _at_boundary(text: str, i: int) -> bool:
+    """True where a regex word boundary would match at index `i` of `text`."""
+    before = i > 0 and _is_word_char(text[i - 1])
+    after  = i < len(text) and _is_word_char(text[i])
+    return before != after
+
+
+def _find_skills(lower_text: str) -> Set[str]:
+    """Every known skill that occurs in `lower_text`, via a single scan."""
+    if _SKILL_AC is not None:
+        return {
+            skill for end, skill in _SKILL_AC.iter(lower_text)
+            if _at_boundary(lower_text, end - len(skill) + 1)
+            and _at_boundary(lower_text, end + 1)
+        }
+
+    pattern = _SKILL_RE2 if _SKILL_RE2 is not None and lower_text.isascii() else _SKILL_RE
+    found = set(pattern.findall(lower_text))
+    for skill in list(found):
+        found.update(_NESTED_SKILLS[skill])
+    return found
+
+
+@lru_cache(maxsize=256)
+def _extract_skills_in_text(text: str) -> FrozenSet[str]:
+    """Known skills in `text`. Cached: one JD is usually scored against many resumes."""
+    return frozenset(_find_skills(_prepare(text).lower))
+
+
 def _match_skills(resume_text: str, jd_text: str) -> Dict[str, List[str]]:
     """Return matched / missing skills based on the job description."""
-    resume_lower = resume_text.lower()
-    jd_lower     = jd_text.lower()
-
-    jd_skills: List[str] = []
-    for skill in ALL_SKILLS:
-        # Use word-boundary matching for short tokens to avoid false positives
-        pattern = r"\b" + re.escape(skill) + r"\b"
-        if re.search(pattern, jd_lower):
-            jd_skills.append(skill)
-
-    matched: List[str] = []
-    missing: List[str] = []
-    for skill in jd_skills:
-        pattern = r"\b" + re.escape(skill) + r"\b"
-        if re.search(pattern, resume_lower):
-            matched.append(skill)
-        else:
-            missing.append(skill)
+    resume_skills = _extract_skills_in_text(resume_text)
+    jd_skills     = _extract_skills_in_text(jd_text)
 
+    # Report in taxonomy order, as before
+    ordered = [s for s in _SKILLS_IN_ORDER if s in jd_skills]
     return {
-        "matched": list(dict.fromkeys(matched)),
-        "missing": list(dict.fromkeys(missing)),
+        "matched": [s for s in ordered if s in resume_skills],
+        "missing": [s for s in ordered if s not in resume_skills],
     }
 
 
+@lru_cache(maxsize=256)
+def _keyword_set(text: str, n: int) -> FrozenSet[str]:
+    """`_top_keywords` as a set, cached like `_extract_skills_in_text`."""
+    return frozenset(_top_keywords(text, n))
+
+
 def _keyword_overlap(resume_text: str, jd_text: str) -> Dict[str, List[str]]:
     """Find keywords present in JD that are / aren't in the resume."""
-    jd_kws     = set(_top_keywords(jd_text,     n=40))
-    resume_kws = set(_top_keywords(resume_text, n=60))
+    jd_kws     = _keyword_set(jd_text,     40)
+    resume_kws = _keyword_set(resume_text, 60)
     matched    = sorted(jd_kws & resume_kws)[:20]
     missing    = sorted(jd_kws - resume_kws)[:20]
     return {"matched": matched, "missing": missing}
 
 
+# ── Format / ATS Patterns (compiled once) ─────────────────────────────────────
+
+_EMAIL_RE   = re.compile(r"\b[\w.+-]+@[\w-]+\.[a-z]{2,}\b")
+_PHONE_RE   = re.compile(r"\+?[\d\s()\-]{7,15}")
+_YEAR_RE    = re.compile(r"\b(20\d{2}|19\d{2})\b")
+_TABLE_RE   = re.compile(r"\|.+\|")
+_BULLET_RE  = re.compile(r"[★✓✔➤►●▪▸]")
+_SECTION_RE = re.compile(r"\b(experience|work|project|skill)\b")
+
+_HEADINGS = ["experience", "education", "skills", "summary", "objective",
+             "projects", "certifications", "achievements"]
+# Substring match like `h in lower`; lookahead so adjacent headings still count
+_HEADING_RE = re.compile(r"(?=(" + "|".join(_HEADINGS) + r"))")
+
+# Checked with plain `in`: CPython's substring search beats a regex
+# alternation over these few literals, especially when none occur
+_ACTION_VERBS = ("led", "built", "designed", "managed", "developed", "implemented",
+                 "improved", "reduced", "increased", "achieved", "created", "delivered")
+
+
 # ── Format Score (heuristic) ───────────────────────────────────────────────────
 
 def _format_score(resume_text: str) -> int:
     score = 0
-    lower = resume_text.lower()
-    words = resume_text.split()
+    doc   = _prepare(resume_text)
+    lower = doc.lower
 
     # Length
-    if 300 <= len(words) <= 1200:
+    if 300 <= doc.n_words <= 1200:
         score += 25
-    elif len(words) > 100:
+    elif doc.n_words > 100:
         score += 12
 
     # Contact info
-    if re.search(r"\b[\w.+-]+@[\w-]+\.[a-z]{2,}\b", lower):
+    if _EMAIL_RE.search(lower):
         score += 15
-    if re.search(r"\+?[\d\s()\-]{7,15}", resume_text):
+    if _PHONE_RE.search(resume_text):
         score += 10
 
     # Section headings
-    headings = ["experience", "education", "skills", "summary", "objective",
-                "projects", "certifications", "achievements"]
-    found = sum(1 for h in headings if h in lower)
+    found = len(set(_HEADING_RE.findall(lower)))
     score += min(found * 5, 30)
 
     # Dates
-    if re.search(r"\b(20\d{2}|19\d{2})\b", resume_text):
+    if _YEAR_RE.search(resume_text):
         score += 10
 
     # Action verbs
-    verbs = ["led", "built", "designed", "managed", "developed", "implemented",
-             "improved", "reduced", "increased", "achieved", "created", "delivered"]
-    if any(v in lower for v in verbs):
+    if any(v in lower for v in _ACTION_VERBS):
         score += 10
 
     return min(score, 100)
@@ -252,19 +401,20 @@ def _format_score(resume_text: str) -> int:
 
 def _ats_check(resume_text: str) -> List[str]:
     issues: List[str] = []
-    lower = resume_text.lower()
+    doc   = _prepare(resume_text)
+    lower = doc.lower
 
-    if re.search(r"\|.+\|", resume_text):
+    if _TABLE_RE.search(resume_text):
         issues.append("Avoid tables – ATS parsers may skip content inside them.")
-    if re.search(r"[★✓✔➤►●▪▸]", resume_text):
+    if _BULLET_RE.search(resume_text):
         issues.append("Replace special bullet characters with plain hyphens or asterisks.")
-    if not re.search(r"\b[\w.+-]+@[\w-]+\.[a-z]{2,}\b", resume_text):
+    if not _EMAIL_RE.search(resume_text):
         issues.append("No email address detected – make sure your contact info is in plain text.")
-    if not re.search(r"\+?[\d\s()\-]{7,14}", resume_text):
+    if not _PHONE_RE.search(resume_text):
         issues.append("No phone number detected – ensure contact details are ATS-readable.")
-    if len(resume_text.split()) < 150:
+    if doc.n_words < 150:
         issues.append("Resume seems very short. Consider adding more detail to relevant sections.")
-    if not re.search(r"\b(experience|work|project|skill)\b", lower):
+    if not _SECTION_RE.search(lower):
         issues.append("Key sections (Experience, Skills, Projects) not detected. Use standard headings.")
 
     return issues
@@ -272,6 +422,12 @@ def _ats_check(resume_text: str) -> List[str]:
 
 # ── Suggestions ───────────────────────────────────────────────────────────────
 
+@lru_cache(maxsize=None)
+def _bank_picks(score: int) -> Tuple[str, ...]:
+    """General tips for a score. Seeds a private RNG so the global one is left alone."""
+    return tuple(Random(score).sample(SUGGESTIONS_BANK, k=min(3, len(SUGGESTIONS_BANK))))
+
+
 def _generate_suggestions(score: int, missing_skills: List[str],
                            missing_keywords: List[str]) -> List[str]:
     suggestions: List[str] = []
@@ -290,8 +446,7 @@ def _generate_suggestions(score: int, missing_skills: List[str],
     else:
         suggestions.append("Strong match! Fine-tune language to mirror the exact phrasing in the JD.")
 
-    random.seed(score)
-    suggestions += random.sample(SUGGESTIONS_BANK, k=min(3, len(SUGGESTIONS_BANK)))
+    suggestions += _bank_picks(score)
     return suggestions[:8]
 
 
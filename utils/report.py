@@ -4,49 +4,126 @@ Completely fixes the multi_cell width issue
 """
 
 import os
+import time
 import tempfile
 import logging
-from datetime import datetime
-from typing import Dict, Any
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# fpdf2 is imported and the PDF subclass built once per process, not per report
+try:
+    from fpdf import FPDF
+    _HAS_FPDF = True
+except ImportError:
+    FPDF = None
+    _HAS_FPDF = False
 
-def generate_pdf_report(data: Dict[str, Any]) -> str:
-    """Generate PDF report and return temp file path."""
-    try:
-        return _build_pdf_with_fpdf(data)
-    except Exception as exc:
-        logger.exception("PDF generation failed: %s", exc)
-        return _text_fallback(data)
-
+_FOOTER_SUFFIX = ' | Built by Hassan Ahmed'
 
-def _build_pdf_with_fpdf(data: Dict[str, Any]) -> str:
-    """Build PDF using fpdf2 with completely fixed width handling."""
-    from fpdf import FPDF
+if _HAS_FPDF:
+    class _ResumePDF(FPDF):
+        """FPDF with the report's branded header and footer."""
 
-    class PDF(FPDF):
         def header(self):
             self.set_fill_color(15, 23, 42)
             self.rect(0, 0, 210, 35, 'F')
-            self.set_font('Arial', 'B', 20)
+            self.set_font('helvetica', 'B', 20)
             self.set_text_color(0, 245, 212)
             self.set_y(12)
             self.cell(0, 8, 'AI Resume Analyzer', align='C')
             self.ln(8)
-            self.set_font('Arial', '', 10)
+            self.set_font('helvetica', '', 10)
             self.set_text_color(148, 163, 184)
             self.cell(0, 6, 'Professional Resume Analysis Report', align='C')
             self.ln(10)
 
         def footer(self):
             self.set_y(-15)
-            self.set_font('Arial', '', 8)
+            self.set_font('helvetica', '', 8)
             self.set_text_color(148, 163, 184)
-            self.cell(0, 10, f'Page {self.page_no()} | Built by Hassan Ahmed', align='C')
+            self.cell(0, 10, f'Page {self.page_no()}{_FOOTER_SUFFIX}', align='C')
+
+
+@lru_cache(maxsize=1)
+def _minute_str(minute: int) -> str:
+    return datetime.fromtimestamp(minute * 60, timezone.utc).strftime('%Y-%m-%d %H:%M')
+
+
+def _now_str() -> str:
+    """Current UTC time to the minute, formatted once per minute."""
+    return _minute_str(int(time.time() // 60))
 
+
+# Typographic punctuation outside latin-1, mapped to ASCII look-alikes
+_TYPOGRAPHY = str.maketrans({
+    '\u2013': '-', '\u2014': '-', '\u2018': "'", '\u2019': "'",
+    '\u201c': '"', '\u201d': '"', '\u2022': '*', '\u2026': '...',
+})
+
+
+def _latin1(value) -> str:
+    """`value` as text the core PDF fonts can encode; anything else becomes '?'.
+
+    One stray character (an accented filename, an em-dash in a suggestion)
+    would otherwise fail the whole PDF and drop to the text report.
+    """
+    text = str(value)
+    if text.isascii():
+        return text
+    return text.translate(_TYPOGRAPHY).encode('latin-1', 'replace').decode('latin-1')
+
+
+# Score badge color for every score 0-100: green 80+, amber 50-79, red below
+_SCORE_COLORS = tuple(
+    (34, 197, 94) if s >= 80 else ((245, 158, 11) if s >= 50 else (239, 68, 68))
+    for s in range(101)
+)
+
+
+def _write_temp(suffix: str, data) -> str:
+    """Write `data` to a new temp file straight through its fd; return the path."""
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    return path
+
+
+def generate_pdf_report(data: Dict[str, Any]) -> str:
+    """Generate PDF report and return temp file path."""
+    if not _HAS_FPDF:
+        return _text_fallback(data)
+    try:
+        return _build_pdf_with_fpdf(data)
+    except Exception as exc:
+        logger.exception("PDF generation failed: %s", exc)
+        return _text_fallback(data)
+
+
+def generate_pdf_report_batch(items: List[Dict[str, Any]],
+                              workers: Optional[int] = None) -> List[str]:
+    """Generate many reports in parallel worker processes; paths in input order.
+
+    fpdf2 rendering is pure-Python CPU work, so threads would just contend
+    for the GIL. Each report is independent, so they spread across cores.
+    """
+    if len(items) < 2:
+        return [generate_pdf_report(data) for data in items]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(generate_pdf_report, items))
+
+
+def _build_pdf_with_fpdf(data: Dict[str, Any]) -> str:
+    """Build PDF using fpdf2 with completely fixed width handling."""
     # Create PDF with safe margins
-    pdf = PDF()
+    pdf = _ResumePDF()
     pdf.set_auto_page_break(auto=True, margin=20)
     pdf.add_page()
     pdf.set_margins(25, 40, 25)  # Large safe margins
@@ -55,12 +132,20 @@ def _build_pdf_with_fpdf(data: Dict[str, Any]) -> str:
 
     # Get data
     score = data.get('score', 0)
-    filename = str(data.get('filename', 'Unknown'))[:35]
-    job_title = str(data.get('job_title') or '—')[:30]
-    created = data.get('created_at', datetime.utcnow().strftime('%Y-%m-%d %H:%M'))
+    filename = _latin1(data.get('filename', 'Unknown'))[:35]
+    job_title = _latin1(data.get('job_title') or '-')[:30]
+    created = data.get('created_at') or _now_str()
+
+    # Each list is sliced to what the report shows and made latin-1 safe, once
+    matched_kw     = [_latin1(k) for k in (data.get('matched_keywords') or [])[:20]]
+    missing_kw     = [_latin1(k) for k in (data.get('missing_keywords') or [])[:20]]
+    matched_skills = [_latin1(k) for k in (data.get('matched_skills') or [])[:15]]
+    missing_skills = [_latin1(k) for k in (data.get('missing_skills') or [])[:15]]
+    suggestions    = [_latin1(k) for k in (data.get('suggestions') or [])[:8]]
+    ats_issues     = [_latin1(k) for k in (data.get('ats_issues') or [])[:8]]
 
     # Meta info
-    pdf.set_font('Arial', 'B', 10)
+    pdf.set_font('helvetica', 'B', 10)
     pdf.set_text_color(255, 255, 255)
     pdf.cell(0, 6, f'Resume: {filename}')
     pdf.ln(5)
@@ -71,89 +156,85 @@ def _build_pdf_with_fpdf(data: Dict[str, Any]) -> str:
 
     # Overall Score
     _section_title(pdf, 'Overall Match Score')
-    score_color = (34, 197, 94) if score >= 80 else ((245, 158, 11) if score >= 50 else (239, 68, 68))
+    score_color = _SCORE_COLORS[max(0, min(100, int(score)))]
 
-    pdf.set_font('Arial', 'B', 48)
+    pdf.set_font('helvetica', 'B', 48)
     pdf.set_text_color(*score_color)
     pdf.cell(0, 18, f'{score}%', align='C')
     pdf.ln(20)
 
-    pdf.set_font('Arial', '', 10)
+    pdf.set_font('helvetica', '', 10)
     pdf.set_text_color(148, 163, 184)
     pdf.cell(0, 6, f"Keywords: {data.get('keyword_score', 0)}%  |  Skills: {data.get('skills_score', 0)}%  |  Format: {data.get('format_score', 0)}%", align='C')
     pdf.ln(12)
 
-    # Matched Keywords
-    _section_title(pdf, 'Matched Keywords')
-    matched_kw = data.get('matched_keywords', [])
-    if matched_kw:
-        _write_tags(pdf, matched_kw[:20], (34, 197, 94))
+    if not any((matched_kw, missing_kw, matched_skills, missing_skills, suggestions, ats_issues)):
+        # Nothing to break down: one notice instead of six empty sections
+        _section_title(pdf, 'Analysis Details')
+        _write_line(pdf, 'No detailed analysis available', italic=True)
     else:
-        _write_line(pdf, 'No matched keywords found', italic=True)
+        # Matched Keywords
+        _section_title(pdf, 'Matched Keywords')
+        if matched_kw:
+            _write_tags(pdf, matched_kw, (34, 197, 94))
+        else:
+            _write_line(pdf, 'No matched keywords found', italic=True)
 
-    # Missing Keywords
-    _section_title(pdf, 'Missing Keywords')
-    missing_kw = data.get('missing_keywords', [])
-    if missing_kw:
-        _write_tags(pdf, missing_kw[:20], (239, 68, 68))
-    else:
-        _write_line(pdf, 'No missing keywords', italic=True)
+        # Missing Keywords
+        _section_title(pdf, 'Missing Keywords')
+        if missing_kw:
+            _write_tags(pdf, missing_kw, (239, 68, 68))
+        else:
+            _write_line(pdf, 'No missing keywords', italic=True)
 
-    # Skills You Have
-    _section_title(pdf, 'Skills You Have')
-    matched_skills = data.get('matched_skills', [])
-    if matched_skills:
-        _write_bullets(pdf, matched_skills[:15], (34, 197, 94), '+')
-    else:
-        _write_line(pdf, 'No matching skills detected', italic=True)
+        # Skills You Have
+        _section_title(pdf, 'Skills You Have')
+        if matched_skills:
+            _write_bullets(pdf, matched_skills, (34, 197, 94), '+')
+        else:
+            _write_line(pdf, 'No matching skills detected', italic=True)
 
-    # Skills to Add
-    _section_title(pdf, 'Skills to Add')
-    missing_skills = data.get('missing_skills', [])
-    if missing_skills:
-        _write_bullets(pdf, missing_skills[:15], (239, 68, 68), '-')
-    else:
-        _write_line(pdf, 'No additional skills needed', italic=True)
-
-    # AI Suggestions
-    _section_title(pdf, 'AI Improvement Suggestions')
-    suggestions = data.get('suggestions', [])
-    if suggestions:
-        for i, suggestion in enumerate(suggestions[:8], 1):
-            _write_numbered(pdf, i, suggestion)
-    else:
-        _write_line(pdf, 'No suggestions available', italic=True)
+        # Skills to Add
+        _section_title(pdf, 'Skills to Add')
+        if missing_skills:
+            _write_bullets(pdf, missing_skills, (239, 68, 68), '-')
+        else:
+            _write_line(pdf, 'No additional skills needed', italic=True)
 
-    # ATS Check
-    _section_title(pdf, 'ATS Compatibility Check')
-    ats_issues = data.get('ats_issues', [])
-    if ats_issues:
-        _write_bullets(pdf, ats_issues[:8], (245, 158, 11), '!')
-    else:
-        pdf.set_font('Arial', 'B', 10)
-        pdf.set_text_color(34, 197, 94)
-        pdf.cell(0, 6, 'Passed - No major ATS issues detected')
-        pdf.ln(6)
+        # AI Suggestions
+        _section_title(pdf, 'AI Improvement Suggestions')
+        if suggestions:
+            for i, suggestion in enumerate(suggestions, 1):
+                _write_numbered(pdf, i, suggestion)
+        else:
+            _write_line(pdf, 'No suggestions available', italic=True)
+
+        # ATS Check
+        _section_title(pdf, 'ATS Compatibility Check')
+        if ats_issues:
+            _write_bullets(pdf, ats_issues, (245, 158, 11), '!')
+        else:
+            pdf.set_font('helvetica', 'B', 10)
+            pdf.set_text_color(34, 197, 94)
+            pdf.cell(0, 6, 'Passed - No major ATS issues detected')
+            pdf.ln(6)
 
     # Footer note
     pdf.ln(10)
-    pdf.set_font('Arial', 'I', 8)
+    pdf.set_font('helvetica', 'I', 8)
     pdf.set_text_color(100, 116, 139)
     _write_line(pdf, 'This report was generated by AI Resume Analyzer. Scores are estimates. Use as guidance.')
 
     # Save to temp file
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf', mode='wb')
-    pdf_output = pdf.output()
-    tmp.write(pdf_output)
-    tmp.close()
+    path = _write_temp('.pdf', pdf.output())
 
-    logger.info(f"PDF generated successfully: {tmp.name}")
-    return tmp.name
+    logger.info("PDF generated successfully: %s", path)
+    return path
 
 
 def _section_title(pdf, title: str):
     """Add section title."""
-    pdf.set_font('Arial', 'B', 12)
+    pdf.set_font('helvetica', 'B', 12)
     pdf.set_text_color(0, 245, 212)
     pdf.cell(0, 8, title)
     pdf.ln(8)
@@ -161,7 +242,7 @@ def _section_title(pdf, title: str):
 
 def _write_line(pdf, text: str, italic=False):
     """Write a single line safely."""
-    pdf.set_font('Arial', 'I' if italic else '', 9)
+    pdf.set_font('helvetica', 'I' if italic else '', 9)
     pdf.set_text_color(148, 163, 184)
 
     # Truncate if needed
@@ -178,7 +259,7 @@ def _write_tags(pdf, items, color):
     if not items:
         return
 
-    pdf.set_font('Arial', '', 9)
+    pdf.set_font('helvetica', '', 9)
     pdf.set_text_color(*color)
 
     # Calculate max width
@@ -205,24 +286,26 @@ def _write_tags(pdf, items, color):
 
 
 def _write_bullets(pdf, items, color, marker='+'):
-    """Write bulleted list with safe width."""
+    """Write bulleted list with safe width. Callers pass `items` pre-sliced."""
     if not items:
         return
 
     max_width = pdf.w - pdf.l_margin - pdf.r_margin - 10
 
-    for item in items[:15]:
+    # Measure in the body font; only the marker switches to bold
+    pdf.set_font('helvetica', '', 9)
+    for item in items:
         item_str = str(item)
 
         # Truncate if too long
         while pdf.get_string_width(item_str) > max_width and len(item_str) > 15:
             item_str = item_str[:-10] + '...'
 
-        pdf.set_font('Arial', 'B', 9)
+        pdf.set_font('helvetica', 'B', 9)
         pdf.set_text_color(*color)
         pdf.cell(6, 5, marker)
 
-        pdf.set_font('Arial', '', 9)
+        pdf.set_font('helvetica', '', 9)
         pdf.set_text_color(203, 213, 225)
         pdf.cell(0, 5, item_str)
         pdf.ln(5)
@@ -239,11 +322,11 @@ def _write_numbered(pdf, num: int, text: str):
     while pdf.get_string_width(text_str) > max_width * 2 and len(text_str) > 30:
         text_str = text_str[:-15] + '...'
 
-    pdf.set_font('Arial', 'B', 9)
+    pdf.set_font('helvetica', 'B', 9)
     pdf.set_text_color(0, 245, 212)
     pdf.cell(10, 5, f'{num}.')
 
-    pdf.set_font('Arial', '', 9)
+    pdf.set_font('helvetica', '', 9)
     pdf.set_text_color(203, 213, 225)
 
     # Use cell instead of multi_cell to avoid the error
@@ -253,25 +336,28 @@ def _write_numbered(pdf, num: int, text: str):
         pdf.cell(0, 5, text_str)
         pdf.ln(5)
     else:
-        # Split into multiple lines manually
-        words = text_str.split()
-        current_line = ""
-
-        for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            if pdf.get_string_width(test_line) > remaining_width:
+        # Split into multiple lines manually. Core-font widths are additive,
+        # so each word is measured once instead of re-measuring the line.
+        space_width = pdf.get_string_width(" ")
+        current_line, current_width = "", 0.0
+
+        for word in text_str.split():
+            word_width = pdf.get_string_width(word)
+            test_width = current_width + space_width + word_width if current_line else word_width
+            if test_width > remaining_width:
                 if current_line:
                     pdf.cell(0, 5, current_line)
                     pdf.ln(5)
                     pdf.cell(10, 5, '')  # Indent
-                    current_line = word
+                    current_line, current_width = word, word_width
                 else:
                     # Word itself is too long
                     pdf.cell(0, 5, word[:50] + '...')
                     pdf.ln(5)
-                    current_line = ""
+                    current_line, current_width = "", 0.0
             else:
-                current_line = test_line
+                current_line = current_line + " " + word if current_line else word
+                current_width = test_width
 
         if current_line:
             pdf.cell(0, 5, current_line)
@@ -280,48 +366,54 @@ def _write_numbered(pdf, num: int, text: str):
     pdf.ln(2)
 
 
+# Fixed parts of the text report, encoded once
+_TXT_RULE   = '=' * 70
+_TXT_HEADER = f'{_TXT_RULE}\nAI RESUME ANALYZER - ANALYSIS REPORT\n{_TXT_RULE}\n\n'.encode('utf-8')
+_TXT_FOOTER = f'\n{_TXT_RULE}\nBuilt by Hassan Ahmed - AI Resume Analyzer\n{_TXT_RULE}'.encode('utf-8')
+_TXT_SUGGESTIONS_HEADING = b'\nAI SUGGESTIONS:\n'
+_TXT_ATS_HEADING         = b'\nATS ISSUES:\n'
+_TXT_NO_ATS_ISSUES       = b'  No issues detected\n'
+
+
 def _text_fallback(data: Dict[str, Any]) -> str:
     """Generate plain text fallback report."""
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.txt', mode='w', encoding='utf-8')
-
-    lines = [
-        '=' * 70,
-        'AI RESUME ANALYZER - ANALYSIS REPORT',
-        '=' * 70,
-        '',
-        f"Resume: {data.get('filename', 'Unknown')}",
-        f"Job Title: {data.get('job_title', '—')}",
-        f"Overall Score: {data.get('score', 0)}%",
-        f"  - Keywords: {data.get('keyword_score', 0)}%",
-        f"  - Skills: {data.get('skills_score', 0)}%",
-        f"  - Format: {data.get('format_score', 0)}%",
-        f"Date: {data.get('created_at', '')}",
-        '',
-        'MATCHED KEYWORDS:',
-        *[f'  + {k}' for k in data.get('matched_keywords', [])[:25]],
-        '',
-        'MISSING KEYWORDS:',
-        *[f'  - {k}' for k in data.get('missing_keywords', [])[:25]],
-        '',
-        'MATCHED SKILLS:',
-        *[f'  + {s}' for s in data.get('matched_skills', [])],
-        '',
-        'MISSING SKILLS:',
-        *[f'  - {s}' for s in data.get('missing_skills', [])],
-        '',
-        'AI SUGGESTIONS:',
-        *[f'  {i+1}. {s}' for i, s in enumerate(data.get('suggestions', []))],
-        '',
-        'ATS ISSUES:',
-        *([f'  ! {issue}' for issue in data.get('ats_issues', [])] if data.get('ats_issues') else ['  No issues detected']),
-        '',
-        '=' * 70,
-        'Built by Hassan Ahmed - AI Resume Analyzer',
-        '=' * 70,
-    ]
-
-    tmp.write('\n'.join(lines))
-    tmp.close()
-
-    logger.warning(f"PDF generation failed, created text fallback: {tmp.name}")
-    return tmp.name
+    buf = bytearray(_TXT_HEADER)
+
+    def w(text: str):
+        buf.extend(text.encode('utf-8'))
+
+    w(f"Resume: {data.get('filename', 'Unknown')}\n")
+    w(f"Job Title: {data.get('job_title', '—')}\n")
+    w(f"Overall Score: {data.get('score', 0)}%\n")
+    w(f"  - Keywords: {data.get('keyword_score', 0)}%\n")
+    w(f"  - Skills: {data.get('skills_score', 0)}%\n")
+    w(f"  - Format: {data.get('format_score', 0)}%\n")
+    w(f"Date: {data.get('created_at', '')}\n")
+
+    for title, marker, items in (
+        ('MATCHED KEYWORDS', '+', data.get('matched_keywords', [])[:25]),
+        ('MISSING KEYWORDS', '-', data.get('missing_keywords', [])[:25]),
+        ('MATCHED SKILLS',   '+', data.get('matched_skills', [])),
+        ('MISSING SKILLS',   '-', data.get('missing_skills', [])),
+    ):
+        w(f'\n{title}:\n')
+        for item in items:
+            w(f'  {marker} {item}\n')
+
+    buf.extend(_TXT_SUGGESTIONS_HEADING)
+    for i, s in enumerate(data.get('suggestions', []), 1):
+        w(f'  {i}. {s}\n')
+
+    buf.extend(_TXT_ATS_HEADING)
+    ats_issues = data.get('ats_issues')
+    if ats_issues:
+        for issue in ats_issues:
+            w(f'  ! {issue}\n')
+    else:
+        buf.extend(_TXT_NO_ATS_ISSUES)
+    buf.extend(_TXT_FOOTER)
+
+    path = _write_temp('.txt', buf)
+
+    logger.warning("PDF generation failed, created text fallback: %s", path)
+    return path